@@ -1,47 +1,128 @@
 ﻿import argparse
 import csv
 import re
+import socket
 import time
-from urllib.parse import urlparse, urljoin
+from functools import lru_cache
+from urllib.parse import unquote_plus, urlparse, urljoin
+
+# Process-wide DNS cache: resolve each (host, port, ...) at most once per
+# _dns_ttl seconds, so long runs still notice records that move. requests/
+# urllib3 and the asyncio resolver used by httpx look socket.getaddrinfo up on
+# every call, so installing it from main() is early enough for all of them.
+_dns_ttl = 300
+_resolve = socket.getaddrinfo
+
+
+@lru_cache(maxsize=4096)
+def _cached_getaddrinfo(epoch, *args, **kwargs):
+    return _resolve(*args, **kwargs)
+
+
+def _getaddrinfo(*args, **kwargs):
+    # Entries from an expired epoch are never hit again and age out of the LRU
+    epoch = int(time.monotonic() // _dns_ttl)
+    return _cached_getaddrinfo(epoch, *args, **kwargs)
+
+
+_getaddrinfo.cache_info = _cached_getaddrinfo.cache_info
+
+
+def _install_dns_cache():
+    """Route every socket.getaddrinfo call in this process through the cache."""
+    if not hasattr(socket.getaddrinfo, "cache_info"):
+        socket.getaddrinfo = _getaddrinfo
+
 
 try:
     import scrapy
 except ImportError:
     scrapy = None
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    BeautifulSoup = None
 try:
     import requests
+    from urllib3.util.retry import Retry
 except ImportError:
     requests = None
+    Retry = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+import asyncio
+import importlib.util
+import queue
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import signal
 import sys
+import atexit
 import logging
+import logging.handlers
 import os
 import json
+import operator
 
-# Import parse_address and is_valid_url from utils
+# Import the shared parsing helpers from utils
 try:
-    from src.utils import parse_address, is_valid_url
+    from src.utils import (
+        parse_address,
+        is_valid_url,
+        detect_delimiter,
+        extract_emails_from_html,
+    )
 except ImportError:
-    from utils import parse_address, is_valid_url
+    from utils import (
+        parse_address,
+        is_valid_url,
+        detect_delimiter,
+        extract_emails_from_html,
+    )
 
-# Configure structured logging with timestamps and thread names
-logging.basicConfig(
-    format="[%(asctime)s] [%(threadName)s] %(levelname)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
 
-# Thread-local storage for per-thread Selenium drivers
-thread_local = threading.local()
+def _setup_logging(level):
+    """
+    Configure structured logging with timestamps and thread names. Workers only
+    enqueue records; a single listener thread formats and writes them to stderr,
+    so logging never blocks a worker on the stream lock or a flush.
+    """
+    log_queue = queue.Queue(-1)
+    stream = logging.StreamHandler()
+    stream.setFormatter(
+        logging.Formatter(
+            "[%(asctime)s] [%(threadName)s] %(levelname)s: %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    enqueue = logging.handlers.QueueHandler(log_queue)
+    # Only merge args into the message; the listener applies the real format
+    enqueue.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[enqueue])
+    listener.start()
+    # Drain queued records on exit, including sys.exit from the signal handler
+    atexit.register(listener.stop)
+
+
+# Idle Selenium drivers shared by all worker threads (see selenium_driver)
+_driver_pool = queue.Queue()
+# Bounds how many drivers exist at once; resized by init_driver_pool
+_driver_slots = threading.BoundedSemaphore(3)
 # Keep track of all drivers to quit at the end
 selenium_drivers = []
+# Thread-local storage for per-thread pooled HTTP sessions
+_session_local = threading.local()
+# Emails found per site (see _site_key), shared by all worker threads, kept
+# in least-recently-used order and capped at _email_cache_size sites
+_email_cache = OrderedDict()
+_email_cache_size = 2048
+_email_cache_lock = threading.Lock()
+# Sites being scraped right now, so concurrent rows for one site wait on it
+_email_inflight = {}
 
 
 # Graceful shutdown: quit all Selenium drivers on termination signals
@@ -55,18 +136,54 @@ def handle_exit(signum, frame):
     sys.exit(0)
 
 
-# Register signal handlers for clean exit
-signal.signal(signal.SIGINT, handle_exit)
-signal.signal(signal.SIGTERM, handle_exit)
+def init_driver_pool(size):
+    """Allow at most size Selenium drivers to exist at once."""
+    global _driver_slots
+    _driver_slots = threading.BoundedSemaphore(max(1, size))
+
+
+def _retire_driver(driver):
+    """Quit a driver and forget it so a fresh one is launched in its place."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    try:
+        selenium_drivers.remove(driver)
+    except ValueError:
+        pass
+
+
+@contextmanager
+def selenium_driver():
+    """
+    Borrow a driver from the shared pool, launching one only when no idle
+    driver is available. A driver whose use raises is quit rather than
+    returned, so a broken browser is replaced on the next borrow.
+    """
+    with _driver_slots:
+        try:
+            driver = _driver_pool.get_nowait()
+        except queue.Empty:
+            driver = setup_selenium()
+            selenium_drivers.append(driver)
+        try:
+            yield driver
+        except Exception:
+            _retire_driver(driver)
+            raise
+        _driver_pool.put(driver)
 
 
-def get_selenium_driver():
-    """Return a thread-local Selenium driver, creating it on first access."""
-    if not hasattr(thread_local, "driver"):
-        driver = setup_selenium()
-        thread_local.driver = driver
-        selenium_drivers.append(driver)
-    return thread_local.driver
+def close_driver_pool():
+    """Quit every driver, idle or not, and empty the pool."""
+    while True:
+        try:
+            _driver_pool.get_nowait()
+        except queue.Empty:
+            break
+    for drv in list(selenium_drivers):
+        _retire_driver(drv)
 
 
 try:
@@ -75,12 +192,22 @@ try:
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import (
+        InvalidSessionIdException,
+        NoSuchWindowException,
+        TimeoutException,
+    )
+
+    # Errors meaning the browser itself is gone, not just the page
+    _dead_driver_errors = (InvalidSessionIdException, NoSuchWindowException)
 except ImportError:
     webdriver = None
     Options = None
     By = None
     WebDriverWait = None
     EC = None
+    TimeoutException = None
+    _dead_driver_errors = ()
 
 # Standalone spider class for potential Scrapy integration.
 if scrapy:
@@ -92,74 +219,137 @@ else:
     EmailSpider = None
 
 
+# Third-party trackers and heavy media that never contain contact emails
+_blocked_urls = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    # Images are off in prefs too; this also stops favicons, preloads and fetches
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.mp4",
+    "*.webm",
+]
+
+
 def setup_selenium():
     """Initialize and return a headless Selenium Chrome WebDriver."""
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--ignore-certificate-errors")
-    # Optionally, add --no-sandbox if needed:
-    # chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    # Emails live in the DOM text and mailto: hrefs; skip images, CSS, fonts and plugins
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+            # Never show (or wait on) notification permission prompts
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    # Return from driver.get on DOMContentLoaded instead of the full load event
+    chrome_options.page_load_strategy = "eager"
     driver = webdriver.Chrome(options=chrome_options)
+    # Block trackers and media at the network layer via the DevTools protocol
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _blocked_urls})
+    except Exception as e:
+        logging.debug(f"Could not set blocked URLs: {e}")
+    # Fail fast on pages that never finish loading
+    driver.set_page_load_timeout(15)
     return driver
 
 
-def extract_emails_from_html(html):
-    """Extract emails from HTML while ignoring common image extensions."""
-    emails = set()
-    # Refined regex: ensure we match typical email patterns and exclude common image extensions.
-    email_regex = r"(?i)\b(?!.*\.(?:png|jpg|jpeg|gif|bmp))([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})\b"
-    for match in re.findall(email_regex, html):
-        # Additional filtering: check that email does not include suspicious parts (e.g., 'logo', 'icon')
-        if not any(word in match.lower() for word in ["logo", "icon", "banner"]):
-            emails.add(match)
-    # Check for mailto links
-    soup = BeautifulSoup(html, "html.parser")
-    for a in soup.find_all("a", href=re.compile(r"^mailto:", re.I)):
-        email = a.get("href").split("mailto:")[-1].split("?")[0]
-        if email and not any(word in email.lower() for word in ["logo", "icon"]):
-            emails.add(email)
-    return emails
+# Email extraction patterns, compiled once and shared by every page scan.
+# Email pattern used by the CSV detectors below; pages are scanned by
+# utils.extract_emails_from_html, which compiles the same pattern for bytes
+_email_re = re.compile(
+    r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", re.I
+)
+
+
+def load_page(driver, url):
+    """
+    Navigate to url. The eager page load strategy makes driver.get block until
+    DOMContentLoaded, bounded by the driver's page load timeout; on timeout
+    stop loading and keep whatever DOM has arrived instead of failing the page.
+    """
+    try:
+        driver.get(url)
+    except TimeoutException:
+        logging.warning(f"Page load timed out, using partial DOM: {url}")
+        driver.execute_script("window.stop();")
+
+
+# Serialize the rendered DOM in the page itself and return it as a plain value
+_outer_html_cmd = {
+    "expression": "document.documentElement.outerHTML",
+    "returnByValue": True,
+}
+
+
+def page_html(driver):
+    """Return the rendered page HTML via one CDP evaluate, else page_source."""
+    try:
+        html = driver.execute_cdp_cmd("Runtime.evaluate", _outer_html_cmd)
+        return html["result"]["value"]
+    except Exception as e:
+        if isinstance(e, _dead_driver_errors):
+            raise
+        return driver.page_source
+
+
+# Every link's resolved href and lowercased text in one WebDriver round-trip
+_contact_links_js = """
+return Array.from(document.querySelectorAll('a[href]'))
+    .filter((a) => typeof a.href === 'string')  // SVG links have no plain href
+    .map((a) => [a.href, (a.textContent || '').toLowerCase()]);
+"""
 
 
 def click_contact_page(driver):
     """Attempt to locate and click a 'contact' or 'about' link."""
     try:
-        # Search for links with text containing 'contact' or 'about'
-        links = driver.find_elements(
-            By.XPATH,
-            "//*[contains(translate(text(),'CONTACT','contact'),'contact') or contains(translate(text(),'ABOUT','about'),'about')]",
-        )
-        if links:
-            for link in links:
-                candidate = link.get_attribute("href")
-                if candidate and is_valid_url(candidate):
-                    logging.info(f"Clicking link: {candidate}")
-                    driver.get(candidate)
-                    try:
-                        WebDriverWait(driver, 10).until(
-                            lambda d: d.execute_script("return document.readyState")
-                            == "complete"
-                        )
-                    except Exception:
-                        pass
-                    return driver.page_source
+        # Filter in Python rather than per-element XPath translate() and
+        # get_attribute calls, each of which is a round-trip to the driver
+        for candidate, text in driver.execute_script(_contact_links_js) or []:
+            wanted = "contact" in text or "about" in text
+            if not wanted and "/contact" not in candidate.lower():
+                continue
+            if is_valid_url(candidate):
+                logging.info(f"Clicking link: {candidate}")
+                load_page(driver, candidate)
+                return page_html(driver)
     except Exception as e:
+        if isinstance(e, _dead_driver_errors):
+            raise  # let the pool retire this driver
         logging.error(f"Error clicking contact/about link: {e}")
     # Fallback: try appending /contact to base URL
     try:
         base_url = driver.current_url.rstrip("/")
         fallback_url = base_url + "/contact"
         logging.info(f"Trying fallback URL: {fallback_url}")
-        driver.get(fallback_url)
-        try:
-            WebDriverWait(driver, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-        except Exception:
-            pass
-        return driver.page_source
+        load_page(driver, fallback_url)
+        return page_html(driver)
     except Exception as e:
+        if isinstance(e, _dead_driver_errors):
+            raise  # let the pool retire this driver
         logging.error(f"Fallback error: {e}")
     return ""
 
@@ -170,20 +360,21 @@ def scrape_emails_with_selenium(driver, url):
     If no emails are found, try navigating to a contact page.
     """
     emails_found = set()
+    try:
+        # Drivers are reused across sites; drop cookies so state doesn't bleed over
+        driver.delete_all_cookies()
+    except Exception as e:
+        logging.debug(f"Could not clear cookies: {e}")
     try:
         logging.info(f"Loading base page: {url}")
-        driver.get(url)
-        try:
-            WebDriverWait(driver, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-        except Exception:
-            pass
+        load_page(driver, url)
     except Exception as e:
+        if isinstance(e, _dead_driver_errors):
+            raise  # let the pool retire this driver
         logging.error(f"Error loading base page {url}: {e}")
         return emails_found
 
-    base_html = driver.page_source
+    base_html = page_html(driver)
     logging.debug(f"Base page length: {len(base_html)}")
     emails_found.update(extract_emails_from_html(base_html))
     if emails_found:
@@ -207,53 +398,352 @@ def scrape_emails_from_website(website):
     Use Selenium exclusively to load the provider website,
     attempt to extract emails from the base page,
     and if necessary, navigate to a Contact page.
+    Borrows a driver from the shared pool; drivers are quit on exit only.
     """
     emails_found = set()
-    driver = None
     try:
-        driver = setup_selenium()
-        emails_found = scrape_emails_with_selenium(driver, website)
+        with selenium_driver() as driver:
+            emails_found = scrape_emails_with_selenium(driver, website)
     except Exception as e:
         logging.error(f"Error with Selenium for {website}: {e}")
-    finally:
-        if driver is not None:
-            driver.quit()
     return ";".join(emails_found) if emails_found else ""
 
 
+def _session():
+    """Return a thread-local requests Session with keep-alive connection pooling."""
+    s = getattr(_session_local, "s", None)
+    if s is None:
+        s = requests.Session()
+        # Retry transient gateway errors with backoff; hand back the last
+        # response instead of raising once retries run out
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=8, pool_maxsize=32, max_retries=retry
+        )
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        _session_local.s = s
+    return s
+
+
+# Request headers for the HTTP fetcher
+_http_headers = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/88.0.4324.96 Safari/537.36"
+    ),
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+# Read at most this much of a page body; bounds memory and regex time
+_max_html_bytes = 2_000_000
+# Media types worth parsing; anything else (PDFs, images, archives) is skipped
+_html_content_types = {"text/html", "application/xhtml+xml"}
+# Pages declaring more than this are still scanned up to _max_html_bytes, but
+# never rendered: a browser would have to pull and lay out the whole thing
+_max_render_bytes = 5_000_000
+
+
+def _too_big_to_render(headers, html):
+    """
+    True if a response's Content-Length exceeds _max_render_bytes, or its
+    decoded body filled the _max_html_bytes read. Content-Length is the
+    compressed size of a gzipped page, so only the decoded body catches those.
+    """
+    if len(html) >= _max_html_bytes:
+        return True
+    try:
+        return int(headers.get("Content-Length", 0)) > _max_render_bytes
+    except ValueError:
+        return False
+
+
+def _skip_render_reason(status_code, content_type):
+    """Return why Selenium can't help for this HTTP response, or "" if it might."""
+    # Chrome would be served the same error page (429 and 5xx included; the
+    # requests session has already retried 502/503/504), with no emails either
+    if status_code >= 400:
+        return f"HTTP {status_code}"
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type and media_type not in _html_content_types:
+        return f"non-HTML content ({media_type})"
+    return ""
+
+
 def fetch_emails_with_requests(url, timeout=10):
-    """Attempt to fetch the page via HTTP and extract emails without rendering."""
+    """
+    Attempt to fetch the page via HTTP and extract emails without rendering.
+    Returns (emails, should_try_selenium); the flag is False when emails were
+    found or the response shows a rendered page would not have any either.
+    """
     try:
         logging.info(f"Fetching via requests: {url}")
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/88.0.4324.96 Safari/537.36"
+        with _session().get(
+            url,
+            headers=_http_headers,
+            timeout=timeout,
+            allow_redirects=True,
+            stream=True,
+        ) as resp:
+            reason = _skip_render_reason(
+                resp.status_code, resp.headers.get("Content-Type", "")
             )
-        }
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        html = resp.text
+            if reason:
+                logging.info(f"Skipping {url}: {reason}")
+                return set(), False
+            # Raw bytes go straight to the extractor; no str decode needed
+            html = resp.raw.read(_max_html_bytes, decode_content=True)
+            renderable = not _too_big_to_render(resp.headers, html)
         logging.debug(f"Requests page length: {len(html)}")
         emails = extract_emails_from_html(html)
         if emails:
             logging.info(f"Emails found via requests: {emails}")
         else:
             logging.info("No emails found via requests.")
-        return emails
+        # An empty body has nothing for Selenium to render
+        return emails, not emails and renderable and bool(html.strip())
     except Exception as e:
         logging.error(f"Error fetching via requests for {url}: {e}")
-        return set()
+        return set(), True
+
+
+# Pages at least this large are scanned in a worker process: the regex holds
+# the GIL, so scanning many big pages on threads would serialize on one core
+_process_extract_bytes = 256 * 1024
+# Few pages are that large, and fetch_many scans at most 25 sites at a time;
+# each worker is a whole spawned interpreter, so don't start one per core
+_extract_workers = min(4, os.cpu_count() or 1)
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+
+def _init_extract_worker():
+    """Ignore Ctrl-C in a worker; the parent shuts the pool down instead."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _extraction_pool():
+    """Return the process pool for scanning large pages, starting it on first use."""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            # spawn, not fork: this process already runs logging and I/O threads
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=_extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extract_worker,
+            )
+        return _extract_pool
+
+
+def _close_extraction_pool():
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown()
+            _extract_pool = None
+
+
+async def _scan_emails(html):
+    """Extract emails off the event loop: big pages in a process, others on a thread."""
+    loop = asyncio.get_running_loop()
+    if len(html) >= _process_extract_bytes:
+        try:
+            return await loop.run_in_executor(
+                _extraction_pool(), extract_emails_from_html, html
+            )
+        except BrokenProcessPool as e:
+            logging.warning(f"Extraction process pool failed, using a thread: {e}")
+    return await loop.run_in_executor(None, extract_emails_from_html, html)
+
+
+async def _fetch_emails_async(client, url):
+    """
+    Fetch one page with the shared async client and extract its emails.
+    Returns (emails, should_try_selenium) like fetch_emails_with_requests.
+    """
+    try:
+        async with client.stream("GET", url) as resp:
+            reason = _skip_render_reason(
+                resp.status_code, resp.headers.get("Content-Type", "")
+            )
+            if reason:
+                logging.debug(f"Skipping {url}: {reason}")
+                return set(), False
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) >= _max_html_bytes:
+                    break
+            html = bytes(body[:_max_html_bytes])
+            renderable = not _too_big_to_render(resp.headers, html)
+        # Scan off the event loop so large pages don't stall other fetches
+        emails = await _scan_emails(html)
+        if emails:
+            logging.info(f"Emails found via async HTTP for {url}: {emails}")
+        return emails, not emails and renderable and bool(html.strip())
+    except Exception as e:
+        logging.error(f"Error fetching via async HTTP for {url}: {e}")
+        return set(), True
+
+
+# Pages fetched alongside each base URL, since emails often live only there
+_contact_paths = ("/contact", "/about", "/contact-us")
+
+
+async def _fetch_site_async(client, url):
+    """
+    Fetch the base page and its likely contact pages concurrently, so they share
+    one pooled connection. Returns (url, (emails, should_try_selenium)).
+    """
+    candidates = list(dict.fromkeys([url] + [urljoin(url, p) for p in _contact_paths]))
+    results = await asyncio.gather(
+        *(_fetch_emails_async(client, u) for u in candidates)
+    )
+    emails = set().union(*(found for found, _ in results))
+    # Whether rendering could help is decided by the base page
+    return url, (emails, not emails and results[0][1])
+
+
+async def fetch_many(urls, timeout=10, max_sites=25):
+    """
+    Fetch many sites (base + contact pages) concurrently over one pooled
+    (HTTP/2 when available) client, at most max_sites at a time.
+    Returns a dict mapping each url to its (emails, should_try_selenium).
+    """
+    # Without a bound every site would queue on the pool at once, and those
+    # still waiting when the pool timeout expires would fail over to Selenium.
+    # 25 sites of up to 4 pages each fit the 100-connection pool.
+    sem = asyncio.Semaphore(max_sites)
+
+    async def fetch_site(client, url):
+        async with sem:
+            return await _fetch_site_async(client, url)
+
+    async with httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        # HTTP/2 forbids connection-specific headers, so only send the UA
+        headers={"User-Agent": _http_headers["User-Agent"]},
+        timeout=timeout,
+        follow_redirects=True,
+    ) as client:
+        try:
+            results = await asyncio.gather(*(fetch_site(client, u) for u in urls))
+        finally:
+            _close_extraction_pool()
+    return dict(results)
+
 
+def _render_emails(url, attempts=2):
+    """
+    Scrape url with a pooled Selenium driver. If the browser dies mid-scrape the
+    pool retires it, and the site is retried once on a fresh driver.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            with selenium_driver() as driver:
+                return scrape_emails_with_selenium(driver, url)
+        except _dead_driver_errors as e:
+            logging.warning(f"Browser died on {url} (attempt {attempt}): {e}")
+    return set()
+
+
+def _site_key(url):
+    """Normalize a URL to its lowercased host (minus www.) for per-site caching."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def get_emails_for_website(url, http_result=None, use_cache=True):
+    """
+    Try HTTP fetch for speed, then fall back to Selenium rendering if needed.
+    http_result = (emails, should_try_selenium) of an HTTP fetch already made.
+    Results are cached per site so rows sharing a website are scraped once,
+    even when several workers reach the same site at the same time.
+    """
+    key = _site_key(url) if use_cache else None
+    cached = None
+    while key:
+        with _email_cache_lock:
+            cached = _email_cache.get(key)
+            if cached is not None:
+                _email_cache.move_to_end(key)
+                break
+            pending = _email_inflight.get(key)
+            if pending is None:
+                # Claim the site; other workers wait for this scrape
+                _email_inflight[key] = threading.Event()
+                break
+        # If the scrape in flight fails, the loop claims the site for this call
+        pending.wait()
+    if cached is not None:
+        logging.info(f"Using cached emails for {key}: {cached or 'none'}")
+        return set(cached)
+
+    try:
+        if http_result is None:
+            http_result = fetch_emails_with_requests(url)
+        emails, should_try_selenium = http_result
+        if should_try_selenium:
+            emails = _render_emails(url)
+
+        if key:
+            with _email_cache_lock:
+                _email_cache[key] = frozenset(emails)
+                if len(_email_cache) > _email_cache_size:
+                    _email_cache.popitem(last=False)
+    finally:
+        if key:
+            with _email_cache_lock:
+                _email_inflight.pop(key).set()
+    return set(emails)
+
+
+# Phone numbers as rendered on Google Maps, e.g. "Call (218) 736-6987"
+_maps_phone_re = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+
+# Google Maps selectors, tried in order
+_maps_phone_selectors = [
+    'button[data-tooltip="Call"]',
+    'button[aria-label*="Call"]',
+    '[data-value="phone"]',
+    "span[data-phone-number]",
+    'a[href^="tel:"]',
+]
+_maps_website_selectors = [
+    'a[data-tooltip="Open website"]',
+    'a[aria-label*="Open website"]',
+    '[data-value="website"] a',
+    'a[href^="http"]:not([href*="google.com"]):not([href*="googleusercontent.com"])',
+]
 
-def get_emails_for_website(url):
-    """Try HTTP fetch for speed, then fall back to Selenium rendering if needed."""
-    emails = fetch_emails_with_requests(url)
-    if emails:
-        return emails
-    # Fallback to Selenium using a thread-local driver
-    driver = get_selenium_driver()
-    return scrape_emails_with_selenium(driver, url)
+# Collect every address/phone/website candidate in a single WebDriver round
+# trip instead of one find_elements/get_attribute call per element.
+# arguments[0] = phone selectors, arguments[1] = website selectors.
+_maps_candidates_js = """
+const q = (sel) => {
+    try { return Array.from(document.querySelectorAll(sel)); } catch (e) { return []; }
+};
+const btn = document.querySelector('button[data-tooltip="Copy address"]');
+return {
+    address: (btn && btn.getAttribute('aria-label')) || '',
+    phones: arguments[0].map((sel) => q(sel).map((e) => [
+        e.getAttribute('aria-label') || '',
+        e.href || e.getAttribute('href') || '',
+        (e.innerText || '').trim(),
+    ])),
+    websites: arguments[1].map((sel) => q(sel).map((e) => e.href || '')),
+};
+"""
 
 
 def scrape_google_maps_data(driver, maps_url):
@@ -265,103 +755,69 @@ def scrape_google_maps_data(driver, maps_url):
 
     try:
         logging.info(f"Scraping Google Maps data from: {maps_url}")
-        driver.get(maps_url)
+        load_page(driver, maps_url)
 
-        # Wait for the page to load
+        # Maps renders client-side after DOMContentLoaded, so wait for the
+        # one element we need rather than for the full page
         WebDriverWait(driver, 15).until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, '[data-value="Directions"]')
             )
         )
 
-        # Get full address from "Copy address" button
-        try:
-            btn = driver.find_element(
-                By.CSS_SELECTOR, 'button[data-tooltip="Copy address"]'
-            )
-            aria = btn.get_attribute("aria-label")
-            if aria and ":" in aria:
-                full_address = aria.split(":", 1)[1].strip()
-                logging.info(f"Found address: {full_address}")
-        except Exception as e:
-            logging.debug(f"Could not extract address: {e}")
-
-        # Extract phone number using multiple selectors
-        phone_selectors = [
-            'button[data-tooltip="Call"]',
-            'button[aria-label*="Call"]',
-            '[data-value="phone"]',
-            "span[data-phone-number]",
-            'a[href^="tel:"]',
-        ]
-
-        for selector in phone_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for elem in elements:
-                    # Try aria-label first
-                    aria_label = elem.get_attribute("aria-label")
-                    if aria_label and "Call" in aria_label:
-                        # Extract phone from "Call (218) 736-6987" format
-                        phone_match = re.search(
-                            r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", aria_label
-                        )
-                        if phone_match:
-                            phone = phone_match.group()
-                            logging.info(f"Found phone via aria-label: {phone}")
-                            break
-
-                    # Try href for tel: links
-                    href = elem.get_attribute("href")
-                    if href and href.startswith("tel:"):
-                        phone = href.replace("tel:", "")
-                        logging.info(f"Found phone via href: {phone}")
-                        break
+        candidates = driver.execute_script(
+            _maps_candidates_js, _maps_phone_selectors, _maps_website_selectors
+        )
 
-                    # Try text content
-                    text = elem.text.strip()
-                    phone_match = re.search(
-                        r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text
-                    )
+        # Get full address from "Copy address" button
+        aria = candidates.get("address")
+        if aria and ":" in aria:
+            full_address = aria.split(":", 1)[1].strip()
+            logging.info(f"Found address: {full_address}")
+
+        # Extract phone number, trying each selector's elements in order
+        for elements in candidates.get("phones") or []:
+            for aria_label, href, text in elements:
+                # Try aria-label first
+                if aria_label and "Call" in aria_label:
+                    # Extract phone from "Call (218) 736-6987" format
+                    phone_match = _maps_phone_re.search(aria_label)
                     if phone_match:
                         phone = phone_match.group()
-                        logging.info(f"Found phone via text: {phone}")
+                        logging.info(f"Found phone via aria-label: {phone}")
                         break
 
-                if phone:
+                # Try href for tel: links
+                if href and href.startswith("tel:"):
+                    phone = href.replace("tel:", "")
+                    logging.info(f"Found phone via href: {phone}")
                     break
-            except Exception as e:
-                logging.debug(f"Phone selector {selector} failed: {e}")
+
+                # Try text content
+                phone_match = _maps_phone_re.search(text)
+                if phone_match:
+                    phone = phone_match.group()
+                    logging.info(f"Found phone via text: {phone}")
+                    break
+
+            if phone:
+                break
 
         # Extract website URL
-        website_selectors = [
-            'a[data-tooltip="Open website"]',
-            'a[aria-label*="Open website"]',
-            '[data-value="website"] a',
-            'a[href^="http"]:not([href*="google.com"]):not([href*="googleusercontent.com"])',
-        ]
-
-        for selector in website_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for elem in elements:
-                    href = elem.get_attribute("href")
-                    if (
-                        href
-                        and href.startswith("http")
-                        and "google.com" not in href.lower()
-                    ):
-                        website = href
-                        logging.info(f"Found website: {website}")
-                        break
-                if website:
+        for hrefs in candidates.get("websites") or []:
+            for href in hrefs:
+                if href and href.startswith("http") and not _has_google(href):
+                    website = href
+                    logging.info(f"Found website: {website}")
                     break
-            except Exception as e:
-                logging.debug(f"Website selector {selector} failed: {e}")
+            if website:
+                break
 
         return phone, website, full_address
 
     except Exception as e:
+        if isinstance(e, _dead_driver_errors):
+            raise  # let the pool retire this driver
         logging.error(f"Error scraping Google Maps data: {e}")
         return "", "", ""
 
@@ -370,136 +826,189 @@ def scrape_google_maps_data(driver, maps_url):
 _maps_re = re.compile(r"https?://(?:www\.)?google\.[^/]+/maps/place", re.I)
 _url_re = re.compile(r"https?://\S+", re.I)
 _phone_re = re.compile(r"\(?\d{3}\)?[ \-]?\d{3}[ \-]?\d{4}")
-_email_re = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", re.I)
+_digit_re = re.compile(r"\d")
 _address_re = re.compile(
     r"\d+\s+\d*\s*(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Way|Pl|Place)\b",
     re.I,
 )
 
 # Google domains to exclude when looking for real websites
-_google_domains = [
+_google_domains = (
     "googleusercontent.com",
     "googleapis.com",
     "gstatic.com",
     "google.com",
-]
+)
+
+
+# All Google domains as one case-insensitive alternation: a single scan per string
+_google_re = re.compile("|".join(map(re.escape, _google_domains)), re.I)
+
+
+def _has_google(text):
+    """Return True if a string mentions any Google domain."""
+    return _google_re.search(text) is not None
+
+
+# Fixed clinics_bak.csv positions: maps url, name, address, phone, website
+_bak_indices = (0, 1, 8, 11, 12)
+# The export's header names for those same columns, in the same order
+_bak_headers = ("hfpxzc href", "qBF1Pd", "W4Efsd 4", "UsdlK", "lcr4fd href")
+
+
+def _bak_indices_for(header):
+    """Locate the clinics_bak.csv columns by header name, else the fixed positions."""
+    names = [name.strip() for name in header]
+    if all(name in names for name in _bak_headers):
+        return tuple(names.index(name) for name in _bak_headers)
+    return _bak_indices
+
 
+@lru_cache(maxsize=None)
+def _bak_getter(indices):
+    return operator.itemgetter(*indices)
 
-def parse_row_enhanced(row):
+
+def _bak_columns(cells, indices=_bak_indices):
+    """Return the clinics_bak.csv columns from stripped cells, '' for any missing."""
+    try:
+        # One C-level fetch of every column; only short rows take the slow path
+        return _bak_getter(indices)(cells)
+    except IndexError:
+        n = len(cells)
+        return tuple(cells[i] if i < n else "" for i in indices)
+
+
+def _looks_like_name(text):
+    """True for a non-empty cell that could be the clinic name."""
+    return (
+        text
+        and not text.startswith(("http", "!"))  # Skip Google Maps internal IDs
+        and len(text) < 200
+        and not text.endswith(("=w122-h92-k-no", "=w163-h92-k-no"))
+        and not _has_google(text)
+    )
+
+
+def parse_row_enhanced(row, bak_indices=_bak_indices):
     """
     Enhanced parser that handles both CSV formats:
     - clinics.csv: 14 columns, comma-delimited, no phone/website in CSV
     - clinics_bak.csv: 21 columns, tab-delimited, has phone[11] and website[12]
+      (bak_indices = column positions from _bak_indices_for(header))
 
     Returns (maps_url, clinic_name, website, address, phone, email)
     """
     maps_url = clinic_name = website = address = phone = email = ""
     seen = set()
+    # Strip every cell once up front; both passes below reuse the result
+    cells = [cell.strip() for cell in row]
 
     # Detect format based on column count
     is_bak_format = len(row) > 16  # clinics_bak.csv has 21 columns
 
     if is_bak_format:
-        # clinics_bak.csv format - extract from known positions
-        if len(row) > 0 and row[0].strip():
-            candidate = row[0].strip()
-            if _maps_re.search(candidate):
-                maps_url = candidate
-                seen.add(candidate)
-
-        if len(row) > 1 and row[1].strip():
-            clinic_name = row[1].strip()
-            seen.add(row[1].strip())
-
-        if len(row) > 11 and row[11].strip():
-            phone_candidate = row[11].strip()
+        # clinics_bak.csv format - extract from known positions, reading each
+        # column exactly once
+        (
+            candidate,
+            name_candidate,
+            address_candidate,
+            phone_candidate,
+            website_candidate,
+        ) = _bak_columns(cells, bak_indices)
+
+        if "/maps/place" in candidate.lower() and _maps_re.search(candidate):
+            maps_url = candidate
+            seen.add(candidate)
+
+        if name_candidate:
+            clinic_name = name_candidate
+            seen.add(name_candidate)
+
+        if phone_candidate:
             phone_match = _phone_re.search(phone_candidate)
             if phone_match:
                 phone = phone_match.group()
                 seen.add(phone_candidate)
 
-        if len(row) > 12 and row[12].strip():
-            website_candidate = row[12].strip()
-            if website_candidate.startswith("http") and not any(
-                domain in website_candidate.lower() for domain in _google_domains
-            ):
-                website = website_candidate
-                seen.add(website_candidate)
-
-        if len(row) > 8 and row[8].strip():
-            address_candidate = row[8].strip()
-            if _address_re.search(address_candidate):
-                address = address_candidate
-                seen.add(address_candidate)
+        if website_candidate.startswith("http") and not _has_google(website_candidate):
+            website = website_candidate
+            seen.add(website_candidate)
+
+        if address_candidate and _address_re.search(address_candidate):
+            address = address_candidate
+            seen.add(address_candidate)
     else:
-        # clinics.csv format - use original logic but exclude Google image URLs
-        for cell in row:
-            text = cell.strip()
+        # clinics.csv format - use original logic but exclude Google image URLs.
+        # The first cell no detector claims is remembered as the name, so the
+        # name needs no second pass and the loop can stop once all is found.
+        leftover = None
+        for text in cells:
+            found_all = maps_url and website and phone and email and address
+            if found_all and leftover is not None:
+                break
             if not text:
                 continue
+            tl = text.lower()
+            # Cheap literal prefilters decide which regexes can possibly match
+            has_digit = _digit_re.search(text) is not None
 
-            if not maps_url and _maps_re.search(text):
+            if not maps_url and "/maps/place" in tl and _maps_re.search(text):
                 maps_url = text
                 seen.add(text)
                 continue
 
-            # Enhanced website detection - exclude Google domains
+            # Enhanced website detection - exclude Google domains (incl. google.com/maps)
             if (
                 not website
+                and tl.startswith("http")
+                and not _has_google(text)
                 and _url_re.match(text)
-                and "google.com/maps" not in text
-                and not any(domain in text.lower() for domain in _google_domains)
             ):
                 website = text
                 seen.add(text)
                 continue
 
-            if not phone:
+            if not phone and has_digit:
                 m = _phone_re.search(text)
                 if m:
                     phone = m.group()
                     seen.add(text)
                     continue
 
-            if not email:
+            if not email and "@" in text:
                 m = _email_re.search(text)
                 if m:
                     email = m.group()
                     seen.add(text)
                     continue
 
-            if not address and _address_re.search(text):
+            if not address and has_digit and _address_re.search(text):
                 address = text
                 seen.add(text)
                 continue
 
+            if leftover is None and _looks_like_name(text):
+                leftover = text
+        # A later cell with the same text may have been claimed after all
+        if leftover is not None and leftover not in seen:
+            clinic_name = leftover
+
     # If clinic_name not found yet, use first unseen cell that looks like a name
     if not clinic_name:
-        for cell in row:
-            text = cell.strip()
-            if (
-                text
-                and text not in seen
-                and not text.startswith("http")
-                and len(text) < 200
-                and not any(domain in text.lower() for domain in _google_domains)
-                and not text.endswith("=w122-h92-k-no")
-                and not text.endswith("=w163-h92-k-no")
-                and "googleusercontent.com" not in text.lower()
-                and not text.startswith("!")
-            ):  # Skip Google Maps internal IDs
+        for text in cells:
+            if text not in seen and _looks_like_name(text):
                 clinic_name = text
                 break
 
     # Final fallback - extract name from Maps URL if still no name found
     if not clinic_name and maps_url:
         # Extract church name from Google Maps URL
-        import urllib.parse
-
         if "/place/" in maps_url:
             try:
                 name_part = maps_url.split("/place/")[1].split("/")[0]
-                name_part = urllib.parse.unquote_plus(name_part)
+                name_part = unquote_plus(name_part)
                 if name_part and len(name_part) < 200:
                     clinic_name = name_part
             except Exception:
@@ -508,71 +1017,127 @@ def parse_row_enhanced(row):
     return maps_url, clinic_name, website, address, phone, email
 
 
-def process_csv(input_file, output_file, max_workers=3, force=False):
-    """Read CSV of unknown shape, auto-detect fields, then scrape."""
-    output_rows = []
-    processed_websites = set()
+# Columns of the output CSV, in order; rows are tuples in this order
+_output_fields = [
+    "FIRSTNAME",
+    "WEBSITE",
+    "ADDRESS",
+    "CITY",
+    "PHONE_NUMBER",
+    "EMAIL",
+]
 
-    if not force and os.path.exists(output_file):
-        try:
+
+def _canonical_url(url):
+    """
+    Normalize an identifier for resume checks: lowercased scheme and host, no
+    fragment or trailing slash, so http://X.com/ and http://x.com match. Path
+    case and the query are kept: host/?clinic=1 and host/?clinic=2 are two sites.
+    """
+    url = url.strip()
+    p = urlparse(url)
+    if not p.netloc:
+        return url
+    query = f"?{p.query}" if p.query else ""
+    return f"{p.scheme.lower()}://{p.netloc.lower()}{p.path.rstrip('/')}{query}"
+
+
+def load_processed_websites(output_file, done_file):
+    """
+    Return the set of canonical identifiers already scraped by a previous run.
+    Reads the one-per-line sidecar if present; otherwise falls back to
+    the WEBSITE column of an existing output CSV.
+    """
+    try:
+        if os.path.exists(done_file):
+            with open(done_file, encoding="utf-8") as f:
+                processed = {
+                    _canonical_url(line) for line in f.read().splitlines() if line
+                }
+            logging.info(f"Loaded {len(processed)} processed site(s) from sidecar.")
+            return processed
+        if os.path.exists(output_file):
             with open(output_file, newline="", encoding="utf-8") as outf:
-                existing = list(csv.DictReader(outf))
-            output_rows = existing
-            processed_websites = {r["WEBSITE"] for r in existing if r.get("WEBSITE")}
-            logging.info(f"Loaded {len(existing)} existing row(s).")
-        except Exception as e:
-            logging.error(f"Error loading '{output_file}': {e}")
-    elif force:
+                reader = csv.reader(outf)
+                header = next(reader, [])
+                if "WEBSITE" not in header:
+                    return set()
+                idx = header.index("WEBSITE")
+                processed = {
+                    _canonical_url(r[idx]) for r in reader if len(r) > idx and r[idx]
+                }
+            logging.info(f"Loaded {len(processed)} existing website(s).")
+            return processed
+    except Exception as e:
+        logging.error(f"Error loading '{output_file}': {e}")
+    return set()
+
+
+# How often process_csv pushes finished rows and the sidecar to disk
+_flush_rows = 100
+_flush_seconds = 5
+
+
+def _sync(f):
+    """Flush a file and ask the OS to commit it to disk."""
+    f.flush()
+    try:
+        os.fsync(f.fileno())
+    except OSError as e:
+        logging.debug(f"fsync failed for {f.name}: {e}")
+
+
+def _completed(executor, fn, tasks, limit):
+    """
+    Submit fn(task) for each task, keeping at most limit futures in flight.
+    Yields (task, future) pairs as they finish.
+    """
+    pending = {}
+    for task in tasks:
+        if len(pending) >= limit:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for fut in done:
+                yield pending.pop(fut), fut
+        pending[executor.submit(fn, task)] = task
+    for fut in concurrent.futures.as_completed(pending):
+        yield pending[fut], fut
+
+
+def process_csv(input_file, output_file, max_workers=3, force=False):
+    """Read CSV of unknown shape, auto-detect fields, then scrape."""
+    # Sidecar listing one completed identifier (website or maps url) per line
+    done_file = output_file + ".done"
+    if force:
         logging.info("Force mode enabled.")
+        processed_websites = set()
+    else:
+        processed_websites = load_processed_websites(output_file, done_file)
+    # A sidecar created by this run must start with what the output already
+    # holds: later runs trust it alone, so rows from before it would be redone
+    seed_done = set()
+    if not force and not os.path.exists(done_file):
+        seed_done = set(processed_websites)
 
     tasks = []
-    with open(input_file, newline="", encoding="utf-8-sig") as csvfile:
-        # Enhanced delimiter detection for complex Google Maps URLs
+    # A 1 MiB buffer lets csv.reader pull large files in few read syscalls;
+    # utf-8-sig strips a BOM without a separate pass over the bytes.
+    with open(
+        input_file, buffering=1 << 20, newline="", encoding="utf-8-sig"
+    ) as csvfile:
+        # Delimiter detection via csv.Sniffer, with column-count voting fallback
         sample = csvfile.read(3000)
         csvfile.seek(0)
-
-        # Count different potential delimiters in the sample
-        tab_count = sample.count("\t")
-        comma_count = sample.count(",")
-        semicolon_count = sample.count(";")
-        pipe_count = sample.count("|")
-
-        # Look for the most common delimiter that makes sense
-        delimiter_counts = [
-            (tab_count, "\t"),
-            (comma_count, ","),
-            (semicolon_count, ";"),
-            (pipe_count, "|"),
-        ]
-
-        # Sort by count, descending
-        delimiter_counts.sort(key=lambda x: x[0], reverse=True)
-
-        # Choose delimiter with highest count that's reasonably high
-        delimiter = ","  # default fallback
-        for count, delim in delimiter_counts:
-            if count >= 10:  # Must have at least 10 occurrences
-                delimiter = delim
-                break
-
-        # Override if we detect a clear pattern in the first few lines
-        lines = sample.split("\n")[:5]  # Check first 5 lines
-        for line in lines:
-            if line.count("\t") >= 10 and line.count("\t") > line.count(","):
-                delimiter = "\t"
-                break
-            elif line.count(",") >= 10 and line.count(",") > line.count("\t"):
-                delimiter = ","
-                break
-
+        delimiter = detect_delimiter(sample)
         logging.info(
-            f"Enhanced delimiter detection: {'TAB' if delimiter == chr(9) else repr(delimiter)} "
-            f"(tabs: {tab_count}, commas: {comma_count})"
+            f"Detected delimiter: {'TAB' if delimiter == chr(9) else repr(delimiter)}"
         )
 
         reader = csv.reader(csvfile, delimiter=delimiter)
-        header = next(reader, None)  # skip header
+        header = next(reader, [])  # skip header on the same single pass
         logging.info(f"CSV has {len(header)} columns")
+        bak_indices = _bak_indices_for(header)
 
         # Skip empty rows
         for row in reader:
@@ -580,7 +1145,7 @@ def process_csv(input_file, output_file, max_workers=3, force=False):
                 continue
 
             maps_url, clinic_name, website, address, phone, email = parse_row_enhanced(
-                row
+                row, bak_indices
             )
 
             if not maps_url or not clinic_name:
@@ -590,7 +1155,7 @@ def process_csv(input_file, output_file, max_workers=3, force=False):
                 continue
 
             # Create unique identifier for deduplication
-            identifier = website or maps_url
+            identifier = _canonical_url(website or maps_url)
             if identifier in processed_websites:
                 logging.debug(f"Already processed: {identifier}")
                 continue
@@ -598,59 +1163,109 @@ def process_csv(input_file, output_file, max_workers=3, force=False):
             tasks.append((clinic_name, maps_url, website, address, phone, email))
             processed_websites.add(identifier)
 
-    logging.info(f"Queuing {len(tasks)} tasks with {max_workers} workers.")
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(process_single_enhanced, t): t for t in tasks}
-        for fut in concurrent.futures.as_completed(futures):
-            try:
-                output_rows.extend(fut.result())
-            except Exception as e:
-                logging.error(f"Task {futures[fut]} error: {e}")
+    # Fast path: fetch every website already known from the CSV concurrently,
+    # so the worker pool only has to render the misses with Selenium. Unless
+    # forced, one URL per site is enough: other rows for it hit the cache.
+    prefetched = None
+    if httpx is not None:
+        urls = {}
+        for t in tasks:
+            if t[2] and not t[5]:
+                urls.setdefault(t[2] if force else _site_key(t[2]) or t[2], t[2])
+        urls = sorted(urls.values())
+        if urls:
+            logging.info(f"Prefetching {len(urls)} website(s) via async HTTP.")
+            prefetched = asyncio.run(fetch_many(urls))
 
-    for drv in selenium_drivers:
+    logging.info(f"Queuing {len(tasks)} tasks with {max_workers} workers.")
+    # Stream rows to disk as tasks complete: bounded memory and no lost
+    # progress on a crash. Resumed runs append to the existing output.
+    rows_written = 0
+    # Large buffers coalesce the csv module's per-row writes into few syscalls.
+    # Both files are flushed every _flush_rows rows or _flush_seconds, rows
+    # first (and fsynced, so this holds across an OS crash too): the sidecar
+    # never lists a task whose rows aren't on disk, and a crash only costs the
+    # unflushed tasks, which a resumed run redoes.
+    mode = "w" if force else "a"
+    unflushed, last_flush = 0, time.monotonic()
+    with open(
+        output_file, mode, buffering=1 << 20, newline="", encoding="utf-8"
+    ) as outf, open(done_file, mode, buffering=1 << 20, encoding="utf-8") as donef:
+        writer = csv.writer(outf)
+        if outf.tell() == 0:
+            writer.writerow(_output_fields)
+        if seed_done:
+            donef.writelines(f"{w}\n" for w in sorted(seed_done))
+            _sync(donef)
+        init_driver_pool(max_workers)
         try:
-            drv.quit()
-        except:
-            pass
-
-    # Write output with proper headers
-    with open(output_file, "w", newline="", encoding="utf-8") as outf:
-        fieldnames = [
-            "FIRSTNAME",
-            "WEBSITE",
-            "ADDRESS",
-            "CITY",
-            "PHONE_NUMBER",
-            "EMAIL",
-        ]
-        writer = csv.DictWriter(outf, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in output_rows:
-            writer.writerow(r)
-
-    logging.info(f"Saved {len(output_rows)} rows to '{output_file}'.")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Feed the pool a couple of tasks per worker at a time, so pending
+                # futures and their finished rows never pile up on large inputs
+                completed = _completed(
+                    executor,
+                    lambda t: process_single_enhanced(t, prefetched, not force),
+                    tasks,
+                    2 * max_workers,
+                )
+                # Results are yielded on this thread only, so writes need no lock
+                for task, fut in completed:
+                    try:
+                        rows = fut.result()
+                    except Exception as e:
+                        logging.error(f"Task {task} error: {e}")
+                        continue
+                    writer.writerows(rows)
+                    rows_written += len(rows)
+                    unflushed += len(rows)
+                    _, maps_url, website = task[:3]
+                    donef.write(f"{website or maps_url}\n")
+                    now = time.monotonic()
+                    if unflushed >= _flush_rows or now - last_flush >= _flush_seconds:
+                        _sync(outf)
+                        _sync(donef)
+                        unflushed, last_flush = 0, now
+        finally:
+            # Rows before the sidecar, even when interrupted: closing the files
+            # in reverse order would otherwise flush the sidecar first
+            _sync(outf)
+
+    close_driver_pool()
+
+    logging.info(f"Saved {rows_written} new row(s) to '{output_file}'.")
+
+    dns = _getaddrinfo.cache_info()
+    lookups = dns.hits + dns.misses
+    if lookups:
+        logging.info(
+            f"DNS cache: {dns.hits}/{lookups} hits ({dns.hits / lookups:.0%}), "
+            f"{dns.currsize} host(s) cached"
+        )
 
 
-def process_single_enhanced(task):
+def process_single_enhanced(task, prefetched=None, use_cache=True):
     """
     Enhanced processing function.
     task = (clinic_name, maps_url, website, address, phone, csv_email)
-    returns a list of dicts to write out, including CITY.
+    prefetched = optional {website: (emails, should_try_selenium)} from async HTTP
+    use_cache = reuse emails already scraped for the same site (off with --force)
+    returns a list of row tuples in _output_fields order, including CITY.
     """
     clinic_name, maps_url, website, address, phone, csv_email = task
-    driver = get_selenium_driver()
 
     # First, try to enhance data from Google Maps if needed
     enhanced_phone = phone
     enhanced_website = website
     enhanced_address = address
 
-    # If we're missing critical data, scrape it from Google Maps
+    # If we're missing critical data, scrape it from Google Maps. The driver is
+    # only acquired here, so tasks that never need a browser never launch one.
     if not phone or not website or not address:
         try:
-            scraped_phone, scraped_website, scraped_address = scrape_google_maps_data(
-                driver, maps_url
-            )
+            with selenium_driver() as driver:
+                scraped_phone, scraped_website, scraped_address = (
+                    scrape_google_maps_data(driver, maps_url)
+                )
             enhanced_phone = enhanced_phone or scraped_phone
             enhanced_website = enhanced_website or scraped_website
             enhanced_address = enhanced_address or scraped_address
@@ -673,38 +1288,21 @@ def process_single_enhanced(task):
     elif enhanced_website:
         logging.info(f"{clinic_name}: scraping emails from {enhanced_website}")
         start = time.time()
-        emails_set = get_emails_for_website(enhanced_website)
+        # A prefetched HTTP result means only a miss needs Selenium rendering
+        emails_set = get_emails_for_website(
+            enhanced_website,
+            http_result=(prefetched or {}).get(enhanced_website),
+            use_cache=use_cache,
+        )
         dur = time.time() - start
         logging.info(f"  → found {emails_set or 'none'} in {dur:.1f}s")
     else:
         logging.info(f"{clinic_name}: no website available, skipping email scraping")
         emails_set = set()
 
-    rows_out = []
-    if emails_set:
-        for e in emails_set:
-            rows_out.append(
-                {
-                    "FIRSTNAME": clinic_name,
-                    "WEBSITE": enhanced_website,
-                    "ADDRESS": enhanced_address,
-                    "CITY": city,
-                    "PHONE_NUMBER": enhanced_phone,
-                    "EMAIL": e,
-                }
-            )
-    else:
-        rows_out.append(
-            {
-                "FIRSTNAME": clinic_name,
-                "WEBSITE": enhanced_website,
-                "ADDRESS": enhanced_address,
-                "CITY": city,
-                "PHONE_NUMBER": enhanced_phone,
-                "EMAIL": "",
-            }
-        )
-
+    # One row per email, or a single row with an empty EMAIL
+    row = (clinic_name, enhanced_website, enhanced_address, city, enhanced_phone)
+    rows_out = [row + (e,) for e in emails_set] or [row + ("",)]
     return rows_out
 
 
@@ -738,7 +1336,22 @@ def main():
         default=3,
         help="Number of parallel worker threads (default: 3)",
     )
+    parser.add_argument(
+        "--log-level",
+        dest="log_level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Logging verbosity; WARNING hides per-site progress (default: INFO)",
+    )
     args = parser.parse_args()
+    # Process-wide setup lives here rather than at import: spawned extraction
+    # workers re-import this script, and must not patch DNS, start a second
+    # log listener or run handle_exit on Ctrl-C
+    _setup_logging(args.log_level)
+    _install_dns_cache()
+    # Register signal handlers for clean exit
+    signal.signal(signal.SIGINT, handle_exit)
+    signal.signal(signal.SIGTERM, handle_exit)
     try:
         process_csv(
             args.input_csv, args.output_csv, max_workers=args.workers, force=args.force
@@ -1,10 +1,37 @@
+import csv
 import logging
 import re
-from urllib.parse import urlparse
+from collections import Counter
+from functools import lru_cache
+from urllib.parse import unquote_to_bytes, urlparse
 # BeautifulSoup removed; we'll use regex-based extraction only
 
+# Email patterns compiled once at import instead of on every call. Pages are
+# scanned as bytes: emails are ASCII, and bytes are denser to scan than str,
+# which uses 2 or 4 bytes per character once any non-Latin-1 text appears.
+# The lookbehind only lets a match start at the beginning of a run of
+# local-part characters; otherwise a long run without "@" is rescanned from
+# every offset. Image filenames are filtered after matching, not by lookahead.
+_email_re = re.compile(rb'(?<![a-z0-9._%+-])[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', re.I)
+# Quotes are optional: HTML parsers accept unquoted values like href=mailto:a@b.c
+_mailto_re = re.compile(rb'href\s*=\s*["\']?mailto:([^"\'?>\s]+)', re.I)
+_bad_words = (b'logo', b'icon', b'banner')
+_image_exts = (b'.png', b'.jpg', b'.jpeg', b'.gif', b'.bmp', b'.svg', b'.webp')
+# Case-insensitive filters, so matches are never lowercased into new strings
+_bad_word_re = re.compile(b'|'.join(map(re.escape, _bad_words)), re.I)
+_rejected_email_re = re.compile(
+    _bad_word_re.pattern + rb'|(?:' + b'|'.join(map(re.escape, _image_exts)) + rb')$', re.I)
+# Plain http(s) URLs with a host; anything else is left to urlparse
+_http_url_re = re.compile(r'https?://[^/?#\s\[\]]+', re.I)
+
+@lru_cache(maxsize=4096)
 def is_valid_url(url):
     """Validate a URL by checking its scheme and network location."""
+    # Anything without "scheme://" can't have both parts; skip urlparse for it
+    if not isinstance(url, str) or '://' not in url:
+        return False
+    if _http_url_re.match(url):
+        return True
     try:
         result = urlparse(url)
         return bool(result.scheme and result.netloc)
@@ -13,19 +40,31 @@ def is_valid_url(url):
         return False
 
 def extract_emails_from_html(html):
-    """Extract emails from HTML while ignoring common image extensions."""
+    """Extract emails from HTML (str or bytes), ignoring common image extensions."""
+    if isinstance(html, str):
+        html = html.encode('utf-8', 'ignore')
     emails = set()
-    # Refined regex: ensure we match typical email patterns and exclude common image extensions.
-    email_regex = r'(?i)\b(?!.*\.(?:png|jpg|jpeg|gif|bmp))([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})\b'
-    for match in re.findall(email_regex, html):
-        if not any(word in match.lower() for word in ['logo', 'icon', 'banner']):
-            emails.add(match)
-    # Also extract mailto: links
-    for m in re.findall(r'(?i)mailto:([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})', html):
-        if not any(word in m.lower() for word in ['logo', 'icon']):
-            emails.add(m)
+    # Most pages hold no address at all; memchr-speed scans for "@" (or the
+    # "%40" of a percent-encoded mailto: target) let them skip both regex passes
+    if b'@' not in html and b'%40' not in html:
+        return emails
+    for m in _email_re.finditer(html):
+        match = m.group()
+        # Skip image filenames (e.g. logo@2x.png) and suspicious parts (e.g. 'logo', 'icon')
+        if _rejected_email_re.search(match):
+            continue
+        emails.add(match.decode('ascii'))
+    # Also extract mailto: links; a target may be percent-encoded or hold a
+    # comma-separated list, and only parts that are whole emails count
+    for target in _mailto_re.findall(html):
+        for email in unquote_to_bytes(target).split(b','):
+            email = email.strip()
+            if _email_re.fullmatch(email) and not _bad_word_re.search(email):
+                emails.add(email.decode('ascii'))
     return emails
    
+# Maps often returns the same address for every office of a clinic
+@lru_cache(maxsize=2048)
 def parse_address(full_address):
     """Split a full address string into street, city, and state components."""
     # Split on commas and trim whitespace
@@ -42,4 +81,25 @@ def parse_address(full_address):
         if len(tokens) > 1:
             state = tokens[-1]
             city = ' '.join(tokens[:-1])
-    return street, city, state
\ No newline at end of file
+    return street, city, state
+
+def detect_delimiter(sample, candidates="\t,;|", max_lines=20):
+    """Guess the delimiter of a CSV sample, defaulting to a comma."""
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=candidates).delimiter
+    except csv.Error:
+        pass
+    # Fallback: vote for the delimiter that splits the most lines into the
+    # same (non-zero) number of columns. The last line may be cut off.
+    lines = [line for line in sample.splitlines()[:max_lines] if line.strip()]
+    if len(lines) > 1:
+        lines = lines[:-1]
+    best, best_score = ",", (0, 0)
+    for delim in candidates:
+        counts = Counter(line.count(delim) for line in lines)
+        if not counts:
+            continue
+        columns, votes = counts.most_common(1)[0]
+        if columns and (votes, columns) > best_score:
+            best, best_score = delim, (votes, columns)
+    return best
@@ -0,0 +1,272 @@
+import csv
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import src.email_spider as spider
+
+MAPS = "https://www.google.com/maps/place/%s/data=!4m7"
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.input_csv = os.path.join(tmp.name, "clinics.csv")
+        self.output_csv = os.path.join(tmp.name, "out.csv")
+
+    def write_input(self, *sites, websites=None):
+        websites = websites or {}
+        with open(self.input_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["hfpxzc href", "qBF1Pd", "site", "addr", "phone"])
+            for name in sites:
+                writer.writerow(
+                    [
+                        MAPS % name,
+                        name,
+                        websites.get(name, f"http://{name}.example/"),
+                        "1 Main St",
+                        "(555) 123-4567",
+                    ]
+                )
+
+    def run_resume(self):
+        """Run process_csv without network or browsers; return the tasks it queued."""
+        done = []
+
+        def scrape(task, prefetched=None, use_cache=True):
+            done.append(task)
+            name, _, website, address, phone, _ = task
+            return [(name, website, address, "", phone, "")]
+
+        with mock.patch.object(spider, "httpx", None), mock.patch.object(
+            spider, "process_single_enhanced", scrape
+        ):
+            spider.process_csv(self.input_csv, self.output_csv, max_workers=2)
+        return done
+
+    def test_resume_twice_across_sidecar_migration(self):
+        # Output from before the .done sidecar existed
+        with open(self.output_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(spider._output_fields)
+            writer.writerow(["old", "http://old.example/", "1 Main St", "", "", ""])
+        self.write_input("old")
+        # Nothing new: the first run must still carry the old site into .done
+        self.assertEqual(self.run_resume(), [])
+        self.assertEqual(self.run_resume(), [])
+
+        self.write_input("old", "new")
+        self.assertEqual([t[0] for t in self.run_resume()], ["new"])
+        self.assertEqual(self.run_resume(), [])
+        with open(self.output_csv, newline="", encoding="utf-8") as f:
+            websites = [row[1] for row in csv.reader(f)][1:]
+        self.assertEqual(websites, ["http://old.example/", "http://new.example/"])
+
+    def test_sites_sharing_a_host_are_kept_apart(self):
+        websites = {
+            "one": "http://host.example/?clinic=1",
+            "two": "http://host.example/?clinic=2",
+            "North": "http://host.example/North",
+            "north": "http://host.example/north",
+        }
+        self.write_input(*websites, websites=websites)
+        self.assertEqual(sorted(t[0] for t in self.run_resume()), sorted(websites))
+        self.assertEqual(self.run_resume(), [])
+
+
+class TestEmailCache(unittest.TestCase):
+    def setUp(self):
+        spider._email_cache.clear()
+        spider._email_inflight.clear()
+        self.fetches = []
+        self.renders = []
+        self.fetch_result = ({"info@a.com"}, False)
+        patches = [
+            mock.patch.object(spider, "fetch_emails_with_requests", self.fetch),
+            mock.patch.object(spider, "_render_emails", self.render),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def fetch(self, url):
+        self.fetches.append(url)
+        return self.fetch_result
+
+    def render(self, url):
+        self.renders.append(url)
+        return {"rendered@a.com"}
+
+    def start(self, target):
+        # Daemon, so a waiter that is never released fails the test, not the run
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def test_same_site_is_scraped_once(self):
+        get = spider.get_emails_for_website
+        self.assertEqual(get("http://www.A.com/"), {"info@a.com"})
+        self.assertEqual(get("https://a.com/contact"), {"info@a.com"})
+        self.assertEqual(self.fetches, ["http://www.A.com/"])
+        # use_cache=False (--force) always scrapes
+        get("http://a.com/", use_cache=False)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_falls_back_to_render(self):
+        self.fetch_result = (set(), True)
+        self.assertEqual(
+            spider.get_emails_for_website("http://a.com/"), {"rendered@a.com"}
+        )
+        # A prefetched result skips the HTTP fetch
+        got = spider.get_emails_for_website("http://b.com/", http_result=(set(), True))
+        self.assertEqual(got, {"rendered@a.com"})
+        self.assertEqual(self.fetches, ["http://a.com/"])
+        self.assertEqual(self.renders, ["http://a.com/", "http://b.com/"])
+
+    def test_concurrent_callers_wait_for_one_scrape(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch(url):
+            self.fetches.append(url)
+            started.set()
+            release.wait(5)
+            return ({"info@a.com"}, False)
+
+        results = []
+        with mock.patch.object(spider, "fetch_emails_with_requests", slow_fetch):
+            first = self.start(
+                lambda: results.append(spider.get_emails_for_website("http://a.com/"))
+            )
+            self.assertTrue(started.wait(5))
+            second = self.start(
+                lambda: results.append(spider.get_emails_for_website("http://a.com/x"))
+            )
+            time.sleep(0.1)  # let it reach the in-flight scrape and wait
+            release.set()
+            first.join(5)
+            second.join(5)
+        self.assertFalse(second.is_alive())
+        self.assertEqual(results, [{"info@a.com"}, {"info@a.com"}])
+        self.assertEqual(self.fetches, ["http://a.com/"])
+        self.assertEqual(spider._email_inflight, {})
+
+    def test_failed_scrape_releases_waiters(self):
+        started, release = threading.Event(), threading.Event()
+
+        def failing_fetch(url):
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+                raise RuntimeError("boom")
+            return self.fetch(url)
+
+        errors, results = [], []
+
+        def first_call():
+            try:
+                spider.get_emails_for_website("http://a.com/")
+            except RuntimeError as e:
+                errors.append(e)
+
+        with mock.patch.object(spider, "fetch_emails_with_requests", failing_fetch):
+            first = self.start(first_call)
+            self.assertTrue(started.wait(5))
+            second = self.start(
+                lambda: results.append(spider.get_emails_for_website("http://a.com/"))
+            )
+            time.sleep(0.1)  # let it reach the in-flight scrape and wait
+            release.set()
+            first.join(5)
+            second.join(5)
+        self.assertFalse(second.is_alive())
+        self.assertEqual(len(errors), 1)
+        # The waiter claims the site and scrapes it itself; nothing bad is cached
+        self.assertEqual(results, [{"info@a.com"}])
+        self.assertEqual(self.fetches, ["http://a.com/"])
+        self.assertEqual(spider._email_inflight, {})
+
+    def test_least_recently_used_site_is_evicted(self):
+        get = spider.get_emails_for_website
+        with mock.patch.object(spider, "_email_cache_size", 2):
+            get("http://a.com/")
+            get("http://b.com/")
+            get("http://a.com/")  # a is now more recent than b
+            get("http://c.com/")
+            self.assertEqual(list(spider._email_cache), ["a.com", "c.com"])
+            get("http://a.com/")
+            get("http://b.com/")
+        self.assertEqual(
+            self.fetches,
+            ["http://a.com/", "http://b.com/", "http://c.com/", "http://b.com/"],
+        )
+
+
+class TestCompleted(unittest.TestCase):
+    def test_bounded_window_yields_every_task_once(self):
+        lock = threading.Lock()
+        running = peak = 0
+
+        def work(n):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            if n % 5 == 0:
+                raise ValueError(n)
+            return n * 2
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            submitted = []
+            submit = executor.submit
+
+            def counting_submit(fn, task):
+                submitted.append(task)
+                return submit(fn, task)
+
+            executor.submit = counting_submit
+            seen = []
+            for task, fut in spider._completed(executor, work, range(20), 3):
+                # Never more than limit futures submitted but not yet yielded
+                self.assertLessEqual(len(submitted) - len(seen), 3)
+                seen.append(task)
+                if task % 5 == 0:
+                    self.assertRaises(ValueError, fut.result)
+                else:
+                    self.assertEqual(fut.result(), task * 2)
+        self.assertEqual(sorted(seen), list(range(20)))
+        self.assertLessEqual(peak, 3)
+
+
+class TestCanonicalUrl(unittest.TestCase):
+    def test_scheme_and_host_are_case_insensitive(self):
+        canon = spider._canonical_url
+        self.assertEqual(canon(" HTTP://WWW.Clinic.COM/ "), "http://www.clinic.com")
+        self.assertEqual(
+            canon("http://clinic.com/about/#team"), "http://clinic.com/about"
+        )
+
+    def test_path_case_and_query_are_kept(self):
+        canon = spider._canonical_url
+        self.assertEqual(canon("http://host.com/?clinic=1"), "http://host.com?clinic=1")
+        self.assertNotEqual(
+            canon("http://host.com/?clinic=1"), canon("http://host.com/?clinic=2")
+        )
+        self.assertEqual(
+            canon("http://Host.com/Clinics/North"), "http://host.com/Clinics/North"
+        )
+        self.assertNotEqual(
+            canon("http://host.com/North"), canon("http://host.com/north")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
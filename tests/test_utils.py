@@ -13,11 +13,28 @@ class TestUtils(unittest.TestCase):
         html = "<p>Contact: alice@example.com and bob@domain.org</p>"
         emails = extract_emails_from_html(html)
         self.assertEqual(emails, {"alice@example.com", "bob@domain.org"})
+        # Raw response bytes are accepted as-is
+        self.assertEqual(extract_emails_from_html(html.encode()), emails)
 
         # Exclude image filenames and suspect 'logo' pattern
         html2 = "Logo image: logo@images.png <a href=\"mailto:info@site.com?subject=hi\">Mail</a>"
         emails2 = extract_emails_from_html(html2)
         self.assertEqual(emails2, {"info@site.com"})
+
+        # An image later in the page must not hide earlier emails, and a large
+        # page full of dots must scan in linear time
+        html3 = "<p>info@clinic.org</p>" + "a.b " * 200000 + '<img src="logo.png">'
+        self.assertEqual(extract_emails_from_html(html3), {"info@clinic.org"})
+
+        # A long run of address characters with no "@" must not go quadratic
+        html4 = "<script>" + "x" * 100000 + "</script> sales@clinic.org"
+        self.assertEqual(extract_emails_from_html(html4), {"sales@clinic.org"})
+
+        # mailto: targets count only where they are whole emails, after
+        # percent-decoding and splitting address lists
+        html5 = ('<a href="mailto:contact">x</a> <a href=mailto:info%40x.com>y</a>'
+                 ' <a href="mailto:a@b.com,c@d.org,nobody">z</a>')
+        self.assertEqual(extract_emails_from_html(html5), {"info@x.com", "a@b.com", "c@d.org"})
     
     def test_parse_address(self):
         from src.utils import parse_address
@@ -43,5 +60,31 @@ class TestUtils(unittest.TestCase):
         s4, c4, st4 = parse_address("")
         self.assertEqual((s4, c4, st4), ('', '', ''))
 
+    def test_detect_delimiter(self):
+        from src.utils import detect_delimiter
+        # Tab-delimited wins even though URLs contain commas
+        tsv = "".join("https://maps/place/%s\tName\t123 Main St\n" % (",x" * i) for i in range(5))
+        self.assertEqual(detect_delimiter(tsv), "\t")
+        csv_sample = "".join("name%d,addr,phone,site\n" % i for i in range(5))
+        self.assertEqual(detect_delimiter(csv_sample), ",")
+        # Nothing to go on: default to comma
+        self.assertEqual(detect_delimiter(""), ",")
+
+    def test_single_utils_module(self):
+        import os
+        import src.utils as utils
+        # One canonical utils.py, and it carries every shared helper. Another
+        # utils.py or utils/ anywhere could be picked up by email_spider's
+        # "from utils import" fallback instead.
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+            found += [os.path.relpath(os.path.join(dirpath, d), root) for d in dirnames if d == 'utils']
+            found += [os.path.relpath(os.path.join(dirpath, f), root) for f in filenames if f == 'utils.py']
+        self.assertEqual(found, [os.path.join('src', 'utils.py')])
+        for name in ('parse_address', 'is_valid_url', 'extract_emails_from_html', 'detect_delimiter'):
+            self.assertTrue(callable(getattr(utils, name, None)), name)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file